@@ -26,17 +26,17 @@ Extract Cyberpunk 2077 radios (and jingles) as MP3 files with album art.
 #  OR OTHER DEALINGS IN THE SOFTWARE.
 #
 
-# stdlib
+# The heavier imports are deferred to the functions that use them,
+# so that the command line interface (e.g. ``--help``) starts quickly.
+
+from __future__ import annotations
 
-# 3rd party
-import tqdm
-from cp2077_extractor.audio_data.radio_stations import Track, radio_jingle_ids, radio_stations
-from cp2077_extractor.redarchive_reader import REDArchive
-from domdf_python_tools.paths import PathPlus
-from domdf_python_tools.typing import PathLike
+# stdlib
+from typing import TYPE_CHECKING
 
-# this package
-from cyberpunk_radio_extractor.audio import extract_track
+if TYPE_CHECKING:
+	# 3rd party
+	from domdf_python_tools.typing import PathLike
 
 __all__ = ["extract_radio_songs"]
 
@@ -53,46 +53,35 @@ def extract_radio_songs(
 		album_art_data: dict[str, bytes],
 		jingles: bool = True,
 		verbose: bool = False,
+		max_workers: int | None = None,
 		) -> None:
 	"""
 	Extract Cyberpunk 2077 radios (and jingles) as MP3 files with album art.
 
+	Tracks which have already been extracted are skipped.
+
 	:param install_dir: Path to the Cyberpunk 2077 installation.
 	:param output_dir:
 	:param album_art_data: Mapping of radio station names to album art.
 	:param jingles: Also extract jingles.
 	:param verbose:
+	:param max_workers: The number of tracks to extract in parallel. Defaults to the number of CPUs.
 	"""
 
+	# 3rd party
+	from domdf_python_tools.paths import PathPlus
+
+	# this package
+	from cyberpunk_radio_extractor.jobs import get_pending_jobs, run_jobs
+
 	output_dir_p = PathPlus(output_dir)
 	output_dir_p.maybe_make()
 
 	archive_file = PathPlus(install_dir) / "archive/pc/content" / "audio_2_soundbanks.archive"
-	assert archive_file.is_file()
-
-	archive = REDArchive.load_archive(archive_file)
-	total_tracks = sum(len(sd) for sd in radio_stations.values())
-
-	with open(archive_file, "rb") as fp, tqdm.tqdm(total=total_tracks) as progbar:
-		for station, station_data in radio_stations.items():
-			if verbose:
-				progbar.write(f"===== {station} =====")
-
-			station_dir = output_dir_p / station
-			station_dir.maybe_make()
-
-			for track in station_data:
-				mp3_filename = station_dir / (track.filename_stub + ".mp3")
-				if verbose:
-					progbar.write(f"    {track.filename_stub} -> {mp3_filename}")
-				extract_track(track, station, mp3_filename, archive, fp, album_art_data.get(station))
-				progbar.update()
-
-			if jingles and station in radio_jingle_ids:
-				for wem_name in radio_jingle_ids[station]:
-					mp3_filename = station_dir / f"jingle_{wem_name}.mp3"
-					track = Track(station, "Jingle", wem_name)
-					extract_track(track, station, mp3_filename, archive, fp, album_art_data.get(station))
+	if not archive_file.is_file():
+		raise FileNotFoundError(f"Archive file not found: {archive_file}")
 
-			if verbose:
-				progbar.write('')
+	# Skip tracks which have already been extracted, without touching the archive if there's nothing to do.
+	jobs = get_pending_jobs(output_dir_p, jingles=jingles)
+	if jobs:
+		run_jobs(archive_file, jobs, album_art_data, verbose=verbose, max_workers=max_workers)
@@ -44,6 +44,13 @@ __all__ = ["main"]
 		)
 @click.option("-o", "--output-dir", default="radio", help="Path to write files to.")
 @click.option("-i", "--install-dir", default=None, help="Path to the Cyberpunk 2077 installation.")
+@click.option(
+		"-w",
+		"--workers",
+		type=click.IntRange(min=1),
+		default=None,
+		help="The number of tracks to extract in parallel. Defaults to the number of CPUs.",
+		)
 @flag_option("-j/-J", "--jingles/--no-jingles", default=True, help="Extract jingles for the radio stations.")
 @flag_option("-v", "--verbose", help="Show individual tracks being processed.")
 @click.command()
@@ -52,6 +59,7 @@ def main(
 		install_dir: str | None = None,
 		output_dir: str = "radio",
 		verbose: bool = False,
+		workers: int | None = None,
 		) -> None:
 	"""
 	Extract Cyberpunk 2077 radios (and jingles) as MP3 files with album art.
@@ -59,9 +67,12 @@ def main(
 
 	# 3rd party
 	import dom_toml
+	from domdf_python_tools.paths import PathPlus
 
 	# this package
-	from cyberpunk_radio_extractor.album_art import AlbumArt
+	from cyberpunk_radio_extractor.album_art import get_cached_album_art
+	from cyberpunk_radio_extractor.jobs import get_pending_jobs
+
 	config = dom_toml.load("config.toml")
 
 	if not install_dir:
@@ -73,11 +84,25 @@ def main(
 	assert isinstance(install_dir, str)
 	assert isinstance(output_dir, str)
 
-	aa = AlbumArt(install_dir)
-	album_art_data = aa.get_album_art()
-	album_art_data["misc"] = aa.get_generic_album_art()
+	missing_stations = {station for track, station, mp3_filename in get_pending_jobs(output_dir, jingles=jingles)}
+	if not missing_stations:
+		# Everything has already been extracted.
+		return
+
+	album_art_data = get_cached_album_art(
+			install_dir,
+			PathPlus(output_dir) / ".album_art_cache.pkl",
+			stations=missing_stations,
+			)
 
-	extract_radio_songs(install_dir, output_dir, album_art_data=album_art_data, jingles=jingles, verbose=verbose)
+	extract_radio_songs(
+			install_dir,
+			output_dir,
+			album_art_data=album_art_data,
+			jingles=jingles,
+			verbose=verbose,
+			max_workers=workers,
+			)
 
 
 if __name__ == "__main__":
@@ -27,17 +27,27 @@ Functions for creating album art.
 #
 
 # stdlib
+import functools
+import hashlib
+import os
+import pickle
+from collections.abc import Callable, Collection, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from typing import IO
 
 # 3rd party
+import numpy
 from cp2077_extractor.cr2w.datatypes import CBitmapTexture
 from cp2077_extractor.cr2w.io import parse_cr2w_buffer
 from cp2077_extractor.cr2w.textures import texture_to_image
 from cp2077_extractor.redarchive_reader import REDArchive
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.typing import PathLike
-from PIL import Image, ImageDraw, ImageOps
+from PIL import Image, ImageColor, ImageDraw, ImageOps
+
+# this package
+from cyberpunk_radio_extractor.archive import extract_file, extract_files, map_archive
 
 __all__ = [
 		"AlbumArt",
@@ -45,30 +55,75 @@ __all__ = [
 		"get_album_art",
 		"get_album_art_base",
 		"get_bottom_left_text",
+		"get_cached_album_art",
 		"get_cyberpunk_logo",
 		"get_generic_album_art",
 		"get_icons_atlas",
 		"get_station_logos",
+		"image_to_jpeg_bytes",
 		"image_to_png_bytes",
+		"image_to_webp_bytes",
 		]
 
 image_size: tuple[int, int] = 512, 512
 
 
-def get_bottom_left_text(archive: REDArchive, fp: IO) -> Image.Image:
+_icons_atlas_filename = "base/gameplay/gui/common/icons/radiostations_icons.xbm"
+_scanner_atlas_filename = "base/gameplay/gui/widgets/scanning/scanner_tooltip/atlas_scanner.xbm"
+
+
+def _texture_to_image(texture_data: bytes) -> Image.Image:
 	"""
-	Returns a PIL image with the text for the bottom left corner of the album art.
+	Decode a texture (``.xbm`` file) to a PIL image.
 
-	:param archive: The ``basegame_1_engine.archive`` archive.
-	:param fp: An open file handle for ``basegame_1_engine.archive``.
+	:param texture_data: The contents of the ``.xbm`` file.
 	"""
 
-	scanner_atlas_file = "base/gameplay/gui/widgets/scanning/scanner_tooltip/atlas_scanner.xbm"
-	file = archive.file_list.find_filename(scanner_atlas_file)
-	crw2_file = parse_cr2w_buffer(BytesIO(archive.extract_file(fp, file)))
-	assert isinstance(crw2_file.root_chunk, CBitmapTexture)
+	crw2_file = parse_cr2w_buffer(BytesIO(texture_data))
+	if not isinstance(crw2_file.root_chunk, CBitmapTexture):
+		raise TypeError(f"Expected a CBitmapTexture, got {type(crw2_file.root_chunk).__name__}")
+
 	img: Image.Image = texture_to_image(crw2_file.root_chunk)
-	img = img.crop((745, 305, img.width, 364))
+	return img
+
+
+def _load_texture(texture_data: bytes, cache_dir: PathPlus | None = None) -> Image.Image:
+	"""
+	Decode a texture (``.xbm`` file) to a PIL image, using a PNG copy cached on disk if available.
+
+	:param texture_data: The contents of the ``.xbm`` file.
+	:param cache_dir: Directory to cache decoded textures in, keyed by a hash of the texture data. If :py:obj:`None` the texture is always decoded.
+	"""
+
+	if cache_dir is None:
+		return _texture_to_image(texture_data)
+
+	cache_file = cache_dir / f"{hashlib.blake2b(texture_data, digest_size=16).hexdigest()}.png"
+
+	if cache_file.is_file():
+		with Image.open(cache_file) as cached_img:
+			cached_img.load()
+			return cached_img
+
+	img = _texture_to_image(texture_data)
+
+	# Write to a temporary file first, so a partially written file is never used.
+	cache_dir.maybe_make(parents=True)
+	tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+	img.save(tmp_file, "png", compress_level=1)
+	os.replace(tmp_file, cache_file)
+
+	return img
+
+
+def _crop_bottom_left_text(scanner_atlas: Image.Image) -> Image.Image:
+	"""
+	Crop the text for the bottom left corner of the album art from the scanner atlas, and position it in the corner.
+
+	:param scanner_atlas:
+	"""
+
+	img = scanner_atlas.crop((745, 305, scanner_atlas.width, 364))
 	offset_l, offset_b = 20, 23
 	add_top = image_size[1] - offset_b - img.height
 	add_right = image_size[0] - offset_l - img.width
@@ -77,20 +132,29 @@ def get_bottom_left_text(archive: REDArchive, fp: IO) -> Image.Image:
 	return img
 
 
-def get_album_art_base(
-		bottom_left_text_img: Image.Image,
-		background: Image.Image,
-		) -> tuple[Image.Image, Image.Image]:
+def get_bottom_left_text(archive: REDArchive, fp: IO) -> Image.Image:
 	"""
-	Returns the PIL image to use as the basis of the album art.
+	Returns a PIL image with the text for the bottom left corner of the album art.
 
-	:param bottom_left_text_img:
-	:param background:
+	:param archive: The ``basegame_1_engine.archive`` archive.
+	:param fp: An open file handle for ``basegame_1_engine.archive``.
 	"""
 
-	border_colour = "#913232"
+	file = archive.file_list.find_filename(_scanner_atlas_filename)
+	return _crop_bottom_left_text(_texture_to_image(archive.extract_file(fp, file)))
+
 
-	draw = ImageDraw.Draw(bottom_left_text_img)
+@functools.lru_cache(maxsize=1)
+def _get_border_mask() -> Image.Image:
+	"""
+	Returns a mask of the border around the album art, which is the same for all album art.
+
+	The border is only drawn once per process.
+	"""
+
+	border_mask = Image.new('L', image_size)
+
+	draw = ImageDraw.Draw(border_mask)
 	draw.line(
 			[
 					(17, 17),
@@ -101,10 +165,28 @@ def get_album_art_base(
 					(17, 17),
 					],
 			width=4,
-			fill=border_colour,
+			fill=255,
 			)
-	draw.line([(17, 17 - 2), (17, image_size[1] - 17 + 2)], width=4, fill=border_colour)
-	draw.line([(17, 15), (image_size[0] - 17 + 1, 15)], width=2, fill=border_colour)
+	draw.line([(17, 17 - 2), (17, image_size[1] - 17 + 2)], width=4, fill=255)
+	draw.line([(17, 15), (image_size[0] - 17 + 1, 15)], width=2, fill=255)
+
+	return border_mask
+
+
+def get_album_art_base(
+		bottom_left_text_img: Image.Image,
+		background: Image.Image,
+		) -> tuple[Image.Image, Image.Image]:
+	"""
+	Returns the PIL image to use as the basis of the album art.
+
+	:param bottom_left_text_img:
+	:param background:
+	"""
+
+	border_colour = "#913232"
+
+	bottom_left_text_img.paste(border_colour, mask=_get_border_mask())
 	bottom_left_text_img_bg = Image.composite(
 			Image.new("RGBA", image_size, border_colour),
 			background,
@@ -114,6 +196,53 @@ def get_album_art_base(
 	return bottom_left_text_img_bg, bottom_left_text_img
 
 
+def _div255(values: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Divide the given ``uint16`` array by 255 in place, with the same rounding as Pillow.
+
+	The rounding offset of 128 must already have been added to the values.
+
+	:param values:
+	"""
+
+	# Same rounding as Pillow: (x + 128 + ((x + 128) >> 8)) >> 8
+	values += values >> 8
+	values >>= 8
+	return values
+
+
+def _get_alpha(image: Image.Image) -> numpy.ndarray:
+	"""
+	Returns the given image's values as a transparency mask, as a ``uint8`` array.
+
+	As with :func:`PIL.Image.composite`, this is the alpha channel,
+	or the single band of ``"L"`` and ``"1"`` images.
+	Only the one band is copied, rather than converting the whole image.
+
+	:param image:
+	"""
+
+	if image.mode in {'L', '1'}:
+		return numpy.asarray(image.convert('L'))
+
+	if 'A' not in image.getbands():
+		image = image.convert("RGBA")
+
+	return numpy.asarray(image.getchannel('A'))
+
+
+def _get_centring_offset(size: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Returns the offset of the top left corner needed to centre images of the given sizes in the output image size.
+
+	Where the spare space can't be split evenly the extra pixel goes on the left/top.
+
+	:param size: ``(width, height)`` of the image, or an array of shape ``(n, 2)`` for several images.
+	"""
+
+	return (numpy.array(image_size, dtype=numpy.int32) - size + 1) // 2
+
+
 class AlbumArtHelper:
 	"""
 	Create album art for a radio stations.
@@ -132,6 +261,7 @@ class AlbumArtHelper:
 			graphic_colour: str = "#77ffff",
 			):
 		self.logo_atlas: Image.Image = logo_atlas
+		self._logo_atlas_alpha = _get_alpha(logo_atlas)
 		self.background: Image.Image = Image.new("RGBA", image_size, background_colour)
 		self.foreground: Image.Image = Image.new("RGBA", image_size, graphic_colour)
 
@@ -140,6 +270,32 @@ class AlbumArtHelper:
 		self.album_art_base: Image.Image = album_art_base
 		self.album_art_base_mask: Image.Image = album_art_base_mask
 
+		# The foreground and background are each a single colour, so the colour of each pixel after blending
+		# the logo depends only on the logo's alpha value. A lookup table of all 256 possible colours is
+		# calculated here, so blending becomes a single lookup per pixel.
+		# The blend is ``foreground * mask + background * (255 - mask)``, rearranged to
+		# ``(foreground - background) * mask + background * 255`` to need a single multiplication.
+		# The subtraction may wrap around, but as the result always fits in a ``uint16`` it is still correct.
+		background_rgba = numpy.array(ImageColor.getcolor(background_colour, "RGBA"), dtype=numpy.uint16)
+		foreground_rgba = numpy.array(ImageColor.getcolor(graphic_colour, "RGBA"), dtype=numpy.uint16)
+		alpha_values = numpy.arange(256, dtype=numpy.uint16)[:, numpy.newaxis]
+		self._logo_blend_lut = (foreground_rgba - background_rgba) * alpha_values
+		self._logo_blend_lut += background_rgba * 255 + 128
+		_div255(self._logo_blend_lut)
+
+		# The base only needs blending over the pixels it covers; elsewhere the album art is just the logo.
+		base_mask = _get_alpha(album_art_base_mask)
+		# The base's share of the blend is the same for every station, so is calculated once here.
+		self._album_art_base_pixels = numpy.nonzero(base_mask)
+		album_art_base_mask_array = base_mask[self._album_art_base_pixels][:, numpy.newaxis].astype(numpy.uint16)
+		self._album_art_base_term = numpy.asarray(
+				album_art_base.convert("RGBA"),
+				dtype=numpy.uint16,
+				)[self._album_art_base_pixels]
+		self._album_art_base_term *= album_art_base_mask_array
+		self._album_art_base_term += 128
+		self._album_art_base_inverse_mask = 255 - album_art_base_mask_array
+
 		self.image_bounds: dict[str, tuple[int, int, int, int]] = {
 				"96.1 Ritual FM": (0, 0, 346, 332),
 				"99.9 Impulse": (0, 332, 345, 642),
@@ -157,6 +313,14 @@ class AlbumArtHelper:
 				"92.9 Night FM": (628, 965, logo_atlas.width - 30, logo_atlas.height - 65),
 				}
 
+		# The bounds of each station's logo, and its offset to centre it in the album art, as arrays.
+		# Rows are in the order of ``self._stations``.
+		self._stations: list[str] = list(self.image_bounds)
+		self._station_indices: dict[str, int] = {station: idx for idx, station in enumerate(self._stations)}
+		self._bounds_array = numpy.array(list(self.image_bounds.values()), dtype=numpy.int32)
+
+		self._offsets_array = _get_centring_offset(self._bounds_array[:, 2:] - self._bounds_array[:, :2])
+
 		self.__background_colour = background_colour
 		self.__graphic_colour = graphic_colour
 
@@ -183,9 +347,10 @@ class AlbumArtHelper:
 		:param station:
 		"""
 
-		bounds = self.image_bounds[station]
-		new_img = self.logo_atlas.crop(bounds)
-		return self.expand_to_output_size(new_img)
+		idx = self._station_indices[station]
+		left, top, right, bottom = self._bounds_array[idx].tolist()
+		add_left, add_top = self._offsets_array[idx].tolist()
+		return self._paste_onto_canvas(self.logo_atlas.crop((left, top, right, bottom)), add_left, add_top)
 
 	def expand_to_output_size(self, img: Image.Image) -> Image.Image:
 		"""
@@ -194,23 +359,27 @@ class AlbumArtHelper:
 		:param img:
 		"""
 
-		width, height = img.size
+		add_left, add_top = _get_centring_offset(numpy.array(img.size, dtype=numpy.int32)).tolist()
+		return self._paste_onto_canvas(img, add_left, add_top)
 
-		add_width = image_size[0] - width
+	@staticmethod
+	def _paste_onto_canvas(img: Image.Image, left: int, top: int) -> Image.Image:
+		"""
+		Paste the given image onto a new transparent image of the output image size, at the given position.
 
-		add_left = add_right = add_width // 2
-		if add_width % 2:
-			# Odd
-			add_left += 1
+		Equivalent to :func:`PIL.ImageOps.expand` but without its border drawing.
+		A new image is created for each call (rather than reusing one) as logos are created in parallel.
 
-		add_height = image_size[1] - height
+		:param img:
+		:param left:
+		:param top:
+		"""
 
-		add_top = add_bottom = add_height // 2
-		if add_height % 2:
-			# Odd
-			add_top += 1
+		new_img = Image.new(img.mode, image_size)
+		if img.palette:
+			new_img.putpalette(img.palette)
 
-		new_img = ImageOps.expand(img, (add_left, add_top, add_right, add_bottom))
+		new_img.paste(img, (left, top))
 		return new_img
 
 	def get_album_art(self, station: str) -> Image.Image:
@@ -220,8 +389,25 @@ class AlbumArtHelper:
 		:param station:
 		"""
 
-		station_logo = self.get_station_logo(station)
-		return self.album_art_for_logo(station_logo)
+		return self._album_art_for_station_index(self._station_indices[station])
+
+	def _album_art_for_station_index(self, idx: int) -> Image.Image:
+		"""
+		Returns the album art for the station at the given index in ``self._stations``.
+
+		:param idx:
+		"""
+
+		# Only the logo's alpha channel is needed, so copy that part of the atlas
+		# straight into the middle of an empty mask rather than cropping and expanding the atlas itself.
+		left, top, right, bottom = self._bounds_array[idx].tolist()
+		add_left, add_top = self._offsets_array[idx].tolist()
+
+		logo_mask = numpy.zeros((image_size[1], image_size[0]), dtype=numpy.uint8)
+		logo_region = logo_mask[add_top:add_top + bottom - top, add_left:add_left + right - left]
+		logo_region[:] = self._logo_atlas_alpha[top:bottom, left:right]
+
+		return self._album_art_for_mask(logo_mask)
 
 	def album_art_for_logo(self, logo: Image.Image) -> Image.Image:
 		"""
@@ -230,23 +416,83 @@ class AlbumArtHelper:
 		:param logo:
 		"""
 
-		album_art = Image.composite(self.foreground, self.background, logo)
-		album_art = Image.composite(self.album_art_base, album_art, self.album_art_base_mask)
-		return album_art
+		return self._album_art_for_mask(_get_alpha(logo))
+
+	def _album_art_for_mask(self, logo_mask: numpy.ndarray) -> Image.Image:
+		"""
+		Returns the album art for a logo with the given mask.
+
+		:param logo_mask: ``uint8`` array of the logo's alpha channel.
+		"""
 
+		# Same result as ``Image.composite(self.foreground, self.background, logo)``.
+		album_art = numpy.take(self._logo_blend_lut, logo_mask, axis=0)
 
-def image_to_png_bytes(image: Image.Image) -> bytes:
+		pixels = self._album_art_base_pixels
+		base_blend = album_art[pixels]
+		base_blend *= self._album_art_base_inverse_mask
+		base_blend += self._album_art_base_term
+		album_art[pixels] = _div255(base_blend)
+
+		return Image.fromarray(album_art.astype(numpy.uint8))
+
+
+def image_to_png_bytes(image: Image.Image, compress_level: int = 1) -> bytes:
 	"""
 	Convert a PIL image to PNG, returning the raw PNG bytes.
 
+	:param image:
+	:param compress_level: The zlib compression level, from ``0`` (none) to ``9`` (smallest). The default favours speed over size.
+	"""
+
+	buffer = BytesIO()
+	image.save(buffer, "png", compress_level=compress_level)
+	return buffer.getvalue()
+
+
+def image_to_jpeg_bytes(image: Image.Image) -> bytes:
+	"""
+	Convert a PIL image to JPEG, returning the raw JPEG bytes.
+
+	Any transparency is discarded.
+
 	:param image:
 	"""
 
 	buffer = BytesIO()
-	image.save(buffer, "png")
+	image.convert("RGB").save(buffer, "jpeg", quality=90)
 	return buffer.getvalue()
 
 
+def image_to_webp_bytes(image: Image.Image) -> bytes:
+	"""
+	Convert a PIL image to WebP, returning the raw WebP bytes.
+
+	:param image:
+	"""
+
+	buffer = BytesIO()
+	image.save(buffer, "webp", quality=90, method=0)
+	return buffer.getvalue()
+
+
+def _render_in_parallel(names: Iterable[str], render: Callable[[str], bytes]) -> dict[str, bytes]:
+	"""
+	Render and encode several images in parallel, returning the raw encoded bytes.
+
+	Both numpy and Pillow release the GIL while blending and encoding,
+	so running the whole pipeline for each image in a thread pool lets them overlap.
+
+	:param names: The names of the images, such as radio station names.
+	:param render: Function to return the encoded image for a name.
+	"""
+
+	names = list(names)
+
+	with ThreadPoolExecutor() as executor:
+		return dict(zip(names, executor.map(render, names)))
+
+
 _station_names = {
 		"96.1 Ritual FM",
 		"99.9 Impulse",
@@ -273,12 +519,8 @@ def get_icons_atlas(archive: REDArchive, fp: IO) -> Image.Image:
 	:param fp: Open file handle to the archive.
 	"""
 
-	station_icons_file = "base/gameplay/gui/common/icons/radiostations_icons.xbm"
-	file = archive.file_list.find_filename(station_icons_file)
-	crw2_file = parse_cr2w_buffer(BytesIO(archive.extract_file(fp, file)))
-	assert isinstance(crw2_file.root_chunk, CBitmapTexture)
-	img: Image.Image = texture_to_image(crw2_file.root_chunk)
-	return img
+	file = archive.file_list.find_filename(_icons_atlas_filename)
+	return _texture_to_image(archive.extract_file(fp, file))
 
 
 def get_cyberpunk_logo(archive: REDArchive, fp: IO, logo_filename: str = "cp77_logo_blue.xbm") -> Image.Image:
@@ -290,14 +532,31 @@ def get_cyberpunk_logo(archive: REDArchive, fp: IO, logo_filename: str = "cp77_l
 	:param logo_filename: The filename (in ``base/environment/decoration/cp77_logo/textures``) of the logo. Either ``"cp77_logo_blue.xbm"`` or ``"cp77_logo_yellow.xbm"``.
 	"""
 
-	logo_file = f"base/environment/decoration/cp77_logo/textures/{logo_filename}"
-	file = archive.file_list.find_filename(logo_file)
-	crw2_file = parse_cr2w_buffer(BytesIO(archive.extract_file(fp, file)))
-	assert isinstance(crw2_file.root_chunk, CBitmapTexture)
-	img: Image.Image = texture_to_image(crw2_file.root_chunk)
+	file = archive.file_list.find_filename(_get_cyberpunk_logo_filename(logo_filename))
+	return _resize_cyberpunk_logo(_texture_to_image(archive.extract_file(fp, file)))
+
+
+def _get_cyberpunk_logo_filename(logo_filename: str) -> str:
+	"""
+	Returns the path in the archive of the given Cyberpunk logo texture.
+
+	:param logo_filename: The filename (in ``base/environment/decoration/cp77_logo/textures``) of the logo.
+	"""
+
+	return f"base/environment/decoration/cp77_logo/textures/{logo_filename}"
+
+
+def _resize_cyberpunk_logo(img: Image.Image) -> Image.Image:
+	"""
+	Scale the Cyberpunk logo to fit in the album art.
+
+	:param img:
+	"""
+
+	# Bilinear is noticeably faster than the default (bicubic), and indistinguishable when downscaling this much.
 	scale = (image_size[0] - 60) / img.width
-	img = img.resize((round(img.width * scale), round(img.height * scale)))
-	return img
+	size = (round(img.width * scale), round(img.height * scale))
+	return img.resize(size, resample=Image.Resampling.BILINEAR)
 
 
 class AlbumArt:
@@ -305,6 +564,7 @@ class AlbumArt:
 	Get album art for the game's music files.
 
 	:param install_dir: Path to the Cyberpunk 2077 installation.
+	:param texture_cache_dir: Directory to cache decoded textures in, to avoid decoding them every time. If :py:obj:`None` textures are not cached.
 	"""
 
 	archive_1_file: PathPlus
@@ -312,67 +572,168 @@ class AlbumArt:
 	archive_4_file: PathPlus
 	archive_4: REDArchive
 
-	def __init__(self, install_dir: PathLike) -> None:
+	def __init__(self, install_dir: PathLike, texture_cache_dir: PathLike | None = None) -> None:
 		install_dir = PathPlus(install_dir)
 
 		self.archive_1_file: PathPlus = install_dir / "archive/pc/content/basegame_1_engine.archive"
-		assert self.archive_1_file.is_file()
+		if not self.archive_1_file.is_file():
+			raise FileNotFoundError(f"Archive file not found: {self.archive_1_file}")
 		self.archive_1 = REDArchive.load_archive(self.archive_1_file)
 
 		self.archive_4_file: PathPlus = install_dir / "archive/pc/content/basegame_4_gamedata.archive"
-		assert self.archive_4_file.is_file()
+		if not self.archive_4_file.is_file():
+			raise FileNotFoundError(f"Archive file not found: {self.archive_4_file}")
 		self.archive_4 = REDArchive.load_archive(self.archive_4_file)
 
-	def get_album_art(self) -> dict[str, bytes]:
+		self.texture_cache_dir: PathPlus | None = None
+		if texture_cache_dir is not None:
+			self.texture_cache_dir = PathPlus(texture_cache_dir)
+
+		self._engine_textures: tuple[Image.Image, Image.Image] | None = None
+		self._cyberpunk_logo: Image.Image | None = None
+
+	def _get_engine_textures(self, texture_cache_dir: PathLike | None = None) -> tuple[Image.Image, Image.Image]:
 		"""
-		Get album art for the game's radio stations.
+		Returns the icons atlas and bottom left text, from ``basegame_1_engine.archive``.
+
+		Both are extracted together, so the reads can be batched, and are kept for later calls once decoded.
+
+		:param texture_cache_dir: Directory to cache decoded textures in. Defaults to :attr:`~.texture_cache_dir`.
 		"""
 
-		with open(self.archive_1_file, "rb") as fp:
-			img = get_icons_atlas(self.archive_1, fp)
-			bottom_left_text_img = get_bottom_left_text(self.archive_1, fp)
+		if self._engine_textures is None:
+			with map_archive(self.archive_1_file) as fp:
+				icons_atlas_data, scanner_atlas_data = extract_files(
+						fp,
+						self.archive_1,
+						[
+								self.archive_1.file_list.find_filename(_icons_atlas_filename),
+								self.archive_1.file_list.find_filename(_scanner_atlas_filename),
+								],
+						)
+
+			cache_dir = self._get_texture_cache_dir(texture_cache_dir)
+			icons_atlas = _load_texture(icons_atlas_data, cache_dir)
+			scanner_atlas = _load_texture(scanner_atlas_data, cache_dir)
+			self._engine_textures = icons_atlas, _crop_bottom_left_text(scanner_atlas)
+
+		return self._engine_textures
+
+	def _get_cyberpunk_logo(self, texture_cache_dir: PathLike | None = None) -> Image.Image:
+		"""
+		Returns the Cyberpunk logo, from ``basegame_4_gamedata.archive``, scaled to fit in the album art.
 
-		album_art_data = {}
-		album_art_helper = AlbumArtHelper(logo_atlas=img, bottom_left_text_img=bottom_left_text_img)
+		The logo is kept for later calls once decoded.
 
-		for station in _station_names:
-			album_art_data[station] = image_to_png_bytes(album_art_helper.get_album_art(station))
+		:param texture_cache_dir: Directory to cache decoded textures in. Defaults to :attr:`~.texture_cache_dir`.
+		"""
 
-		return album_art_data
+		if self._cyberpunk_logo is None:
+			file = self.archive_4.file_list.find_filename(_get_cyberpunk_logo_filename("cp77_logo_blue.xbm"))
+
+			with map_archive(self.archive_4_file) as fp:
+				texture_data = extract_file(fp, self.archive_4, file)
+
+			logo = _load_texture(texture_data, self._get_texture_cache_dir(texture_cache_dir))
+			self._cyberpunk_logo = _resize_cyberpunk_logo(logo)
+
+		return self._cyberpunk_logo
+
+	def _get_texture_cache_dir(self, texture_cache_dir: PathLike | None) -> PathPlus | None:
+		if texture_cache_dir is None:
+			return self.texture_cache_dir
+
+		return PathPlus(texture_cache_dir)
+
+	@property
+	def icons_atlas(self) -> Image.Image:
+		"""
+		The radio station icons atlas, from ``basegame_1_engine.archive``.
+		"""
+
+		return self._get_engine_textures()[0]
 
-	def get_generic_album_art(self) -> bytes:
+	@property
+	def bottom_left_text(self) -> Image.Image:
 		"""
-		Get generic album art for game's music files.
+		The text for the bottom left corner of the album art, from ``basegame_1_engine.archive``.
+		"""
+
+		return self._get_engine_textures()[1]
+
+	@property
+	def cyberpunk_logo(self) -> Image.Image:
+		"""
+		The Cyberpunk logo, from ``basegame_4_gamedata.archive``, scaled to fit in the album art.
 		"""
 
-		with open(self.archive_4_file, "rb") as fp:
-			logo_img = get_cyberpunk_logo(self.archive_4, fp)
+		return self._get_cyberpunk_logo()
 
-		with open(self.archive_1_file, "rb") as fp:
-			bottom_left_text_img = get_bottom_left_text(self.archive_1, fp)
+	def get_album_art(
+			self,
+			stations: Collection[str] | None = None,
+			texture_cache_dir: PathLike | None = None,
+			) -> dict[str, bytes]:
+		"""
+		Get album art for the game's radio stations.
 
-		album_art_helper = AlbumArtHelper(logo_atlas=logo_img, bottom_left_text_img=bottom_left_text_img)
+		:param stations: Only get album art for these stations. By default album art is returned for all stations.
+		:param texture_cache_dir: Directory to cache decoded textures in. Defaults to :attr:`~.texture_cache_dir`.
+		"""
+
+		if stations is None:
+			stations = _station_names
+
+		icons_atlas, bottom_left_text = self._get_engine_textures(texture_cache_dir)
+		album_art_helper = AlbumArtHelper(logo_atlas=icons_atlas, bottom_left_text_img=bottom_left_text.copy())
+
+		def render(station: str) -> bytes:
+			return image_to_jpeg_bytes(album_art_helper.get_album_art(station))
+
+		return _render_in_parallel(_station_names.intersection(stations), render)
+
+	def get_generic_album_art(self, texture_cache_dir: PathLike | None = None) -> bytes:
+		"""
+		Get generic album art for game's music files.
+
+		:param texture_cache_dir: Directory to cache decoded textures in. Defaults to :attr:`~.texture_cache_dir`.
+		"""
+
+		logo_img = self._get_cyberpunk_logo(texture_cache_dir)
+		bottom_left_text = self._get_engine_textures(texture_cache_dir)[1]
+		album_art_helper = AlbumArtHelper(logo_atlas=logo_img, bottom_left_text_img=bottom_left_text.copy())
 		logo_img = album_art_helper.expand_to_output_size(logo_img)
-		return image_to_png_bytes(album_art_helper.album_art_for_logo(logo_img))
+		return image_to_jpeg_bytes(album_art_helper.album_art_for_logo(logo_img))
 
 	def get_station_logos(self) -> dict[str, bytes]:
 		"""
 		Get the logos of the game's radio stations.
 		"""
 
-		with open(self.archive_1_file, "rb") as fp:
-			img = get_icons_atlas(self.archive_1, fp)
-
-		station_logos_data = {}
 		album_art_helper = AlbumArtHelper(
-				logo_atlas=img,
+				logo_atlas=self.icons_atlas,
 				bottom_left_text_img=Image.new("RGBA", image_size, "#00000000"),
 				)
 
-		for station in _station_names:
-			station_logos_data[station] = image_to_png_bytes(album_art_helper.get_station_logo(station))
+		def render(station: str) -> bytes:
+			return image_to_png_bytes(album_art_helper.get_station_logo(station))
+
+		return _render_in_parallel(_station_names, render)
 
-		return station_logos_data
+
+def _get_album_art_for_install(install_dir: PathLike) -> AlbumArt:
+	"""
+	Returns an :class:`~.AlbumArt` for the given installation, reusing it (and its loaded archives) between calls.
+
+	:param install_dir: Path to the Cyberpunk 2077 installation.
+	"""
+
+	return _get_album_art_for_resolved_install(PathPlus(install_dir).resolve())
+
+
+@functools.lru_cache(maxsize=4)
+def _get_album_art_for_resolved_install(install_dir: PathPlus) -> AlbumArt:
+	return AlbumArt(install_dir)
 
 
 def get_album_art(install_dir: PathLike) -> dict[str, bytes]:
@@ -382,7 +743,7 @@ def get_album_art(install_dir: PathLike) -> dict[str, bytes]:
 	:param install_dir: Path to the Cyberpunk 2077 installation.
 	"""
 
-	aa = AlbumArt(install_dir)
+	aa = _get_album_art_for_install(install_dir)
 	return aa.get_album_art()
 
 
@@ -393,7 +754,7 @@ def get_generic_album_art(install_dir: PathLike) -> bytes:
 	:param install_dir: Path to the Cyberpunk 2077 installation.
 	"""
 
-	aa = AlbumArt(install_dir)
+	aa = _get_album_art_for_install(install_dir)
 	return aa.get_generic_album_art()
 
 
@@ -404,5 +765,69 @@ def get_station_logos(install_dir: PathLike) -> dict[str, bytes]:
 	:param install_dir: Path to the Cyberpunk 2077 installation.
 	"""
 
-	aa = AlbumArt(install_dir)
+	aa = _get_album_art_for_install(install_dir)
 	return aa.get_station_logos()
+
+
+# Increment when the generated album art changes, to invalidate existing caches.
+_album_art_cache_version = 3
+
+
+def get_cached_album_art(
+		install_dir: PathLike,
+		cache_file: PathLike,
+		stations: Collection[str] | None = None,
+		) -> dict[str, bytes]:
+	"""
+	Get album art for the game's radio stations and music files (as ``"misc"``), caching the result on disk.
+
+	The cache is invalidated if the game's archive files change.
+	Decoded game textures are also cached, in a ``.texture_cache`` directory alongside ``cache_file``.
+
+	:param install_dir: Path to the Cyberpunk 2077 installation.
+	:param cache_file: The file to store the cached album art in.
+	:param stations: Only generate album art for these stations if not already cached. Defaults to all stations.
+	"""
+
+	install_dir = PathPlus(install_dir)
+	cache_file = PathPlus(cache_file)
+
+	if stations is None:
+		stations = {*_station_names, "misc"}
+
+	cache_key: list[object] = [_album_art_cache_version]
+	for archive_name in ("basegame_1_engine.archive", "basegame_4_gamedata.archive"):
+		stat = (install_dir / "archive/pc/content" / archive_name).stat()
+		cache_key.extend([stat.st_mtime_ns, stat.st_size])
+
+	album_art_data: dict[str, bytes] = {}
+
+	if cache_file.is_file():
+		try:
+			with cache_file.open("rb") as fp:
+				cached_key, cached_album_art_data = pickle.load(fp)
+		except (EOFError, pickle.UnpicklingError, ValueError):
+			# The cache is corrupt, so regenerate everything.
+			pass
+		else:
+			if cached_key == cache_key:
+				album_art_data = cached_album_art_data
+
+	missing_stations = {*_station_names, "misc"}.intersection(stations).difference(album_art_data)
+	if not missing_stations:
+		return album_art_data
+
+	aa = _get_album_art_for_install(install_dir)
+	texture_cache_dir = cache_file.parent / ".texture_cache"
+	album_art_data.update(aa.get_album_art(missing_stations, texture_cache_dir=texture_cache_dir))
+	if "misc" in missing_stations:
+		album_art_data["misc"] = aa.get_generic_album_art(texture_cache_dir=texture_cache_dir)
+
+	# Write to a temporary file first, so an interrupted run never leaves a partially written cache.
+	cache_file.parent.maybe_make(parents=True)
+	tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+	with tmp_file.open("wb") as fp:
+		pickle.dump((cache_key, album_art_data), fp, protocol=5)
+	os.replace(tmp_file, cache_file)
+
+	return album_art_data
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+#
+#  archive.py
+"""
+Helpers for reading REDEngine ``.archive`` files.
+"""
+#
+#  Copyright © 2025 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import mmap
+from collections.abc import Iterable, Mapping
+from pathlib import PureWindowsPath
+from typing import IO, cast
+
+# 3rd party
+from cp2077_extractor.redarchive_reader import FileRecord, REDArchive
+from domdf_python_tools.typing import PathLike
+from fnvhash import fnv1a_64  # type: ignore[import-untyped]
+
+__all__ = ["build_file_index", "extract_file", "extract_files", "find_file", "map_archive", "prefetch_file"]
+
+
+def map_archive(archive_file: PathLike) -> IO[bytes]:
+	"""
+	Memory-map the given ``.archive`` file (read-only).
+
+	Reads from the returned object are served directly from the page cache,
+	avoiding the buffered copy made by a regular file object.
+	The returned object should be closed (or used as a context manager) when finished with.
+
+	:param archive_file:
+	"""
+
+	with open(archive_file, "rb") as fp:
+		# mmap implements the ``read``/``seek`` API used by ``REDArchive.extract_file``.
+		return cast(IO[bytes], mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def build_file_index(archive: REDArchive) -> dict[int, FileRecord]:
+	"""
+	Returns a mapping of filename hashes to file records, for fast lookups with :func:`~.find_file`.
+
+	:param archive:
+	"""
+
+	# Reversed so that the first record wins for any duplicate hashes, as with ``FileList.find_filename``.
+	return {record.name_hash: record for record in reversed(archive.file_list.file_records)}
+
+
+def find_file(file_index: Mapping[int, FileRecord], filename: str) -> FileRecord | None:
+	"""
+	Find the record for the given filename, relative to the root of the archive (usually starting ``base``).
+
+	:param file_index: Mapping of filename hashes to file records, from :func:`~.build_file_index`.
+	:param filename:
+
+	:returns: The file record, or :py:obj:`None` if the file is not in the archive.
+	"""
+
+	return file_index.get(fnv1a_64(bytes(PureWindowsPath(filename))))
+
+
+def prefetch_file(fp: IO[bytes], archive: REDArchive, file: FileRecord) -> None:
+	"""
+	Hint to the operating system that the given file will soon be read from the archive.
+
+	This allows the data to be read from disk in the background while other work is done.
+	Has no effect on platforms without :meth:`mmap.mmap.madvise`.
+
+	:param fp: The memory-mapped archive, from :func:`~.map_archive`.
+	:param archive:
+	:param file: The file which will be read.
+	"""
+
+	if not hasattr(mmap, "MADV_WILLNEED"):
+		return
+
+	mm = cast(mmap.mmap, fp)
+	for segment in archive.file_list.get_segments(file):
+		# The start of the range must be aligned to a page boundary.
+		start = segment.offset - segment.offset % mmap.PAGESIZE
+		mm.madvise(mmap.MADV_WILLNEED, start, segment.offset + segment.zsize - start)
+
+
+def extract_file(fp: IO[bytes], archive: REDArchive, file: FileRecord) -> bytes:
+	"""
+	Extract a file from the archive.
+
+	Equivalent to :meth:`REDArchive.extract_file <cp2077_extractor.redarchive_reader.REDArchive.extract_file>`,
+	but uncompressed files in a memory-mapped archive are sliced straight out of the mapping with a single copy.
+
+	:param fp: The archive, preferably memory-mapped with :func:`~.map_archive`.
+	:param archive:
+	:param file: The file to extract.
+	"""
+
+	segments = archive.file_list.get_segments(file)
+
+	if isinstance(fp, mmap.mmap) and len(segments) == 1:
+		segment = segments[0]
+		start, end = segment.offset, segment.offset + segment.zsize
+
+		# Compressed segments start with the signature "KARK" and need decompressing.
+		if segment.size == segment.zsize and fp[start:start + 4] != b"KARK":
+			file_content = fp[start:end]
+
+			if hashlib.sha1(file_content).digest() != file.sha1_hash:
+				raise ValueError(f"Checksum mismatch for file with hash {file.name_hash}")
+
+			return file_content
+
+	return archive.extract_file(fp, file)
+
+
+def extract_files(fp: IO[bytes], archive: REDArchive, files: Iterable[FileRecord]) -> list[bytes]:
+	"""
+	Extract several files from the archive at once.
+
+	Readahead is requested for all the files before any are read,
+	so the operating system can fetch them from disk together.
+	They are then read in the order they appear in the archive.
+
+	:param fp: The memory-mapped archive, from :func:`~.map_archive`.
+	:param archive:
+	:param files: The files to extract.
+
+	:returns: The contents of each file, in the same order as ``files``.
+	"""
+
+	files = list(files)
+
+	for file in files:
+		prefetch_file(fp, archive, file)
+
+	def get_offset(idx: int) -> int:
+		return archive.file_list.file_segments[files[idx].segs_start].offset
+
+	contents: list[bytes] = [b''] * len(files)
+	for idx in sorted(range(len(files)), key=get_offset):
+		contents[idx] = extract_file(fp, archive, files[idx])
+
+	return contents
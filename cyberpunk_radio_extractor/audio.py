@@ -27,15 +27,209 @@ Audio extraction functions.
 #
 
 # stdlib
+from io import BytesIO
 from typing import IO
 
 # 3rd party
+import lameenc  # type: ignore[import-not-found]
 from cp2077_extractor.audio_data.radio_stations import Track
-from cp2077_extractor.redarchive_reader import REDArchive
-from cp2077_extractor.utils import transcode_file
-from domdf_python_tools.paths import PathPlus, TemporaryPathPlus
+from cp2077_extractor.redarchive_reader import FileRecord, REDArchive
+from cp2077_extractor.track import set_tag
+from domdf_python_tools.paths import PathPlus
+from miniaudio import SoundFileInfo, vorbis_get_info, vorbis_read  # type: ignore[import-untyped]
+from mutagen import PaddingInfo
+from mutagen.id3 import (
+		APIC,
+		COMM,
+		ID3,
+		TALB,
+		TCMP,
+		TCOM,
+		TDRC,
+		TIT2,
+		TLEN,
+		TOPE,
+		TPE1,
+		TPE2,
+		Encoding,
+		ID3NoHeaderError
+		)
+from wem2ogg import wem_to_ogg
 
-__all__ = ["extract_track"]
+# this package
+from cyberpunk_radio_extractor.archive import extract_file, map_archive
+
+__all__ = [
+		"build_cover_frame",
+		"extract_track",
+		"extract_track_in_worker",
+		"get_image_mime_type",
+		"get_wem_filename",
+		"init_worker",
+		"set_id3_metadata",
+		"transcode_bytes",
+		"update_id3_tags",
+		]
+
+
+def get_wem_filename(track: Track) -> str:
+	"""
+	Returns the filename of the track's ``.wem`` file within the ``audio_2_soundbanks.archive`` archive.
+
+	:param track:
+	"""
+
+	return fr"base\sound\soundbanks\media\{track.wem_name}.wem"
+
+
+def get_image_mime_type(image_data: bytes) -> str:
+	"""
+	Returns the MIME type of the given image (either PNG, JPEG or WebP).
+
+	:param image_data: The raw bytes of the image.
+	"""
+
+	if image_data.startswith(b"\xff\xd8\xff"):
+		return "image/jpeg"
+
+	if image_data.startswith(b"RIFF") and image_data[8:12] == b"WEBP":
+		return "image/webp"
+
+	return "image/png"
+
+
+def build_cover_frame(album_art: bytes) -> APIC:
+	"""
+	Returns an ID3 frame containing the given album art.
+
+	The frame can be reused for all tracks with the same album art.
+
+	:param album_art: The raw bytes of the album art, in PNG, JPEG or WebP format.
+	"""
+
+	return APIC(encoding=0, mime=get_image_mime_type(album_art), type=3, desc="Cover", data=album_art)
+
+
+#: The minimum padding reserved after the ID3 tags, so they can be updated later without rewriting the whole file.
+_tag_padding = 16 * 1024
+
+
+def _reserve_tag_padding(info: PaddingInfo) -> int:
+	# Reuse any existing padding as is, even if mutagen would consider it too large.
+	# Shrinking it would mean rewriting all the audio data that follows.
+	if info.padding >= 0:
+		return info.padding
+
+	return max(info.get_default_padding(), _tag_padding)
+
+
+def set_id3_metadata(
+		track: Track,
+		mp3_filename: PathPlus,
+		station: str,
+		album_art: bytes | APIC | None = None,
+		) -> None:
+	"""
+	Set ID3 tags on the file (artist, title, performer, writer/composer, album/station, etc.).
+
+	Equivalent to :meth:`Track.set_id3_metadata <cp2077_extractor.track.Track.set_id3_metadata>`,
+	but sets the correct MIME type for JPEG album art.
+
+	:param track:
+	:param mp3_filename: The file to set metadata on.
+	:param station: The name of the radio station, used as the album name.
+	:param album_art: The raw bytes of the album art (in PNG, JPEG or WebP format), or a frame from :func:`~.build_cover_frame`. Optional.
+	"""
+
+	try:
+		tags = ID3(mp3_filename)
+	except ID3NoHeaderError:
+		tags = ID3()
+
+	if update_id3_tags(tags, track, station, album_art):
+		# If the new tags fit in the existing space mutagen overwrites them in place.
+		tags.save(mp3_filename, padding=_reserve_tag_padding)
+
+
+def update_id3_tags(
+		tags: ID3,
+		track: Track,
+		station: str,
+		album_art: bytes | APIC | None = None,
+		) -> bool:
+	"""
+	Update the given ID3 tags with the track's metadata (artist, title, performer, writer/composer, album/station, etc.).
+
+	:param tags:
+	:param track:
+	:param station: The name of the radio station, used as the album name.
+	:param album_art: The raw bytes of the album art (in PNG, JPEG or WebP format), or a frame from :func:`~.build_cover_frame`. Optional.
+
+	:returns: Whether the tags were changed, to inform whether to write tags to file.
+	"""
+
+	tags_changed: bool = any([
+			set_tag(TPE1, track.artist, tags),
+			set_tag(TIT2, track.title, tags),
+			set_tag(TOPE, track.real_artist, tags),
+			set_tag(TCOM, track.writer, tags),
+			set_tag(TALB, station, tags),
+			set_tag(TCMP, '1', tags),
+			set_tag(TDRC, "2023", tags),
+			set_tag(TPE2, "Various Artists", tags),
+			])
+
+	if "COMM::XXX" not in tags or str(tags["COMM::XXX"]) != "From Cyberpunk 2077":
+		tags.add(COMM(encoding=Encoding.UTF8, text="From Cyberpunk 2077"))
+		tags_changed = True
+
+	if album_art:
+		if isinstance(album_art, bytes):
+			cover_frame = build_cover_frame(album_art)
+		else:
+			cover_frame = album_art
+
+		if "APIC:Cover" not in tags or tags["APIC:Cover"].data != cover_frame.data:  # type: ignore[attr-defined]
+			tags.delall("APIC")
+			tags.add(cover_frame)
+			tags_changed = True
+
+	return tags_changed
+
+
+def transcode_bytes(wem_data: bytes, mp3_filename: PathPlus, tags: ID3 | None = None) -> None:
+	"""
+	Transcode a WWise ``.wem`` file to mp3 at 256kbps.
+
+	Equivalent to :func:`cp2077_extractor.utils.transcode_file`,
+	but takes the contents of the ``.wem`` file rather than requiring it to be written to disk first.
+
+	:param wem_data: The contents of the ``.wem`` file.
+	:param mp3_filename: The output filename.
+	:param tags: ID3 tags to write along with the audio, rather than rewriting the file to add them afterwards. The track length is added automatically.
+	"""
+
+	ogg_data = wem_to_ogg(wem_data)
+	ogg_info: SoundFileInfo = vorbis_get_info(ogg_data)
+	pcm_data = bytes(vorbis_read(data=ogg_data).samples)
+
+	encoder = lameenc.Encoder()
+	encoder.set_bit_rate(256)
+	encoder.set_in_sample_rate(ogg_info.sample_rate)
+	encoder.set_channels(ogg_info.nchannels)
+	encoder.set_quality(2)  # 2-highest, 7-fastest
+	mp3_data = encoder.encode(pcm_data)
+	mp3_data += encoder.flush()  # Flush when finished encoding the entire stream
+
+	if tags is None:
+		tags = ID3()
+	tags.add(TLEN(encoding=0, data=ogg_info.duration * 1000))
+	data = tags._prepare_data(BytesIO(mp3_data), 0, 0, 4, '/', _reserve_tag_padding)
+
+	# Written separately rather than concatenated, to avoid copying the whole MP3.
+	with mp3_filename.open("wb") as fp:
+		fp.write(data)
+		fp.write(mp3_data)
 
 
 def extract_track(
@@ -44,24 +238,65 @@ def extract_track(
 		mp3_filename: PathPlus,
 		archive: REDArchive,
 		fp: IO,
-		album_art: bytes | None,
+		album_art: bytes | APIC | None,
+		file: FileRecord | None = None,
 		) -> None:
 	"""
 	Extract the given track and convert to MP3.
 
+	If the MP3 file already exists only its ID3 tags are updated.
+
 	:param track:
 	:param station: The radio station to include the track with.
 	:param mp3_filename: The output filename.
 	:param archive: The ``audio_2_soundbanks.archive`` archive.
 	:param fp: An open file handle to the ``audio_2_soundbanks.archive`` archive.
-	:param album_art: Optional album art.
+	:param album_art: Optional album art, as raw bytes or a frame from :func:`~.build_cover_frame`.
+	:param file: The track's ``.wem`` file in the archive, if already known. Otherwise it is looked up by name, raising :exc:`FileNotFoundError` if the track is not in the archive.
+	"""
+
+	if mp3_filename.is_file():
+		set_id3_metadata(track, mp3_filename, station, album_art=album_art)
+		return
+
+	if file is None:
+		file = archive.file_list.find_filename(get_wem_filename(track))
+
+	tags = ID3()
+	update_id3_tags(tags, track, station, album_art)
+	transcode_bytes(extract_file(fp, archive, file), mp3_filename, tags)
+
+
+# Per-process state for worker processes, set by :func:`init_worker`.
+_worker_archive: REDArchive
+_worker_fp: IO
+_worker_cover_frames: dict[str, APIC]
+
+
+def init_worker(archive_file: PathPlus, album_art_data: dict[str, bytes]) -> None:
+	"""
+	Initializer for worker processes, which loads and memory-maps the archive once per process.
+
+	:param archive_file: Path to the ``audio_2_soundbanks.archive`` archive.
+	:param album_art_data: Mapping of radio station names to album art.
+	"""
+
+	global _worker_archive, _worker_fp, _worker_cover_frames
+
+	_worker_archive = REDArchive.load_archive(archive_file)
+	_worker_fp = map_archive(archive_file)  # Unmapped when the worker process exits.
+	_worker_cover_frames = {station: build_cover_frame(album_art) for station, album_art in album_art_data.items()}
+
+
+def extract_track_in_worker(track: Track, station: str, mp3_filename: PathPlus, file: FileRecord) -> None:
+	"""
+	Extract the given track and convert to MP3, in a worker process initialised with :func:`init_worker`.
+
+	:param track:
+	:param station: The radio station to include the track with.
+	:param mp3_filename: The output filename.
+	:param file: The track's ``.wem`` file in the archive.
 	"""
-	if not mp3_filename.is_file():
-		with TemporaryPathPlus() as tmpdir:
-			wem_filename = tmpdir.joinpath(mp3_filename.with_suffix(".wem").name)
-			file = archive.file_list.find_filename(fr"base\sound\soundbanks\media\{track.wem_name}.wem")
-			contents = archive.extract_file(fp, file)
-			wem_filename.write_bytes(contents)
-			transcode_file(wem_filename, mp3_filename)
 
-	track.set_id3_metadata(mp3_filename, station, album_art=album_art)
+	cover_frame = _worker_cover_frames.get(station)
+	extract_track(track, station, mp3_filename, _worker_archive, _worker_fp, cover_frame, file)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+#
+#  jobs.py
+"""
+Functions for listing and running the tracks to extract.
+"""
+#
+#  Copyright © 2025 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+
+# 3rd party
+import tqdm
+from cp2077_extractor.audio_data.radio_stations import Track, radio_jingle_ids, radio_stations
+from cp2077_extractor.redarchive_reader import FileRecord, REDArchive
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from cyberpunk_radio_extractor.archive import build_file_index, find_file, map_archive, prefetch_file
+from cyberpunk_radio_extractor.audio import extract_track_in_worker, get_wem_filename, init_worker
+
+__all__ = ["get_extraction_jobs", "get_pending_jobs", "run_jobs"]
+
+
+def get_extraction_jobs(output_dir: PathLike, jingles: bool = True) -> list[tuple[Track, str, PathPlus]]:
+	"""
+	Returns the tracks to extract, as tuples of ``(track, station, mp3_filename)``.
+
+	:param output_dir:
+	:param jingles: Also include jingles.
+	"""
+
+	output_dir_p = PathPlus(output_dir)
+	jobs: list[tuple[Track, str, PathPlus]] = []
+
+	for station, station_data in radio_stations.items():
+		station_dir = output_dir_p / station
+
+		for track in station_data:
+			jobs.append((track, station, station_dir / (track.filename_stub + ".mp3")))
+
+		if jingles and station in radio_jingle_ids:
+			for wem_name in radio_jingle_ids[station]:
+				jobs.append((Track(station, "Jingle", wem_name), station, station_dir / f"jingle_{wem_name}.mp3"))
+
+	return jobs
+
+
+def get_pending_jobs(output_dir: PathLike, jingles: bool = True) -> list[tuple[Track, str, PathPlus]]:
+	"""
+	Returns the tracks which have not yet been extracted, as tuples of ``(track, station, mp3_filename)``.
+
+	:param output_dir:
+	:param jingles: Also include jingles.
+	"""
+
+	return [job for job in get_extraction_jobs(output_dir, jingles=jingles) if not job[2].is_file()]
+
+
+def run_jobs(
+		archive_file: PathPlus,
+		jobs: list[tuple[Track, str, PathPlus]],
+		album_art_data: dict[str, bytes],
+		verbose: bool = False,
+		max_workers: int | None = None,
+		) -> None:
+	"""
+	Extract the given tracks in parallel, using a pool of worker processes.
+
+	:param archive_file: Path to the ``audio_2_soundbanks.archive`` archive.
+	:param jobs: The tracks to extract, as tuples of ``(track, station, mp3_filename)``.
+	:param album_art_data: Mapping of radio station names to album art.
+	:param verbose: Show individual tracks as they are extracted.
+	:param max_workers: The number of worker processes. Defaults to the number of CPUs.
+	"""
+
+	archive = REDArchive.load_archive(archive_file)
+	file_index = build_file_index(archive)
+
+	# Look up each track in the archive once, up front, skipping any which are missing.
+	work: list[tuple[Track, str, PathPlus, FileRecord]] = []
+	missing_tracks: list[Track] = []
+	for track, station, mp3_filename in jobs:
+		file = find_file(file_index, get_wem_filename(track))
+		if file is None:
+			missing_tracks.append(track)
+		else:
+			work.append((track, station, mp3_filename, file))
+
+	if missing_tracks:
+		# These will never be extracted, so will be listed as pending every time.
+		wem_names = ", ".join(str(track.wem_name) for track in missing_tracks)
+		tqdm.tqdm.write(f"Skipping {len(missing_tracks)} track(s) not found in the archive: {wem_names}")
+
+	if not work:
+		return
+
+	for station_dir in {mp3_filename.parent for track, station, mp3_filename, file in work}:
+		station_dir.maybe_make(parents=True)
+
+	if max_workers is None:
+		max_workers = os.cpu_count() or 1
+
+	with map_archive(archive_file) as fp, ProcessPoolExecutor(
+			max_workers=max_workers,
+			initializer=init_worker,
+			initargs=(archive_file, album_art_data),
+			) as executor, tqdm.tqdm(total=len(work)) as progbar:
+
+		# Only a bounded number of jobs are queued at once, with the archive data for each prefetched when queued.
+		# That data is then read from disk in the background while the workers are busy transcoding.
+		futures: dict[Future[None], tuple[Track, str, PathPlus]] = {}
+
+		for track, station, mp3_filename, file in work:
+			if len(futures) >= 2 * max_workers:
+				done, _ = wait(futures, return_when=FIRST_COMPLETED)
+				for future in done:
+					_job_done(future, futures.pop(future), progbar, verbose)
+
+			prefetch_file(fp, archive, file)
+
+			# MappingProxyType can't be pickled to send to the worker.
+			picklable_track = track._replace(other_uses=dict(track.other_uses))
+			future = executor.submit(extract_track_in_worker, picklable_track, station, mp3_filename, file)
+			futures[future] = (track, station, mp3_filename)
+
+		for future in as_completed(futures):
+			_job_done(future, futures[future], progbar, verbose)
+
+
+def _job_done(
+		future: Future[None],
+		job: tuple[Track, str, PathPlus],
+		progbar: tqdm.tqdm,
+		verbose: bool,
+		) -> None:
+	# Propagate any exception from the worker.
+	future.result()
+
+	if verbose:
+		track, station, mp3_filename = job
+		progbar.write(f"[{station}] {track.filename_stub} -> {mp3_filename}")
+
+	progbar.update()